@@ -19,194 +19,265 @@ Pin function naming conventions:
 import json
 import re
 import sys
+from collections import Counter, namedtuple
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
+from typing import Optional
 
 
-def get_pin_info(pin_function: str) -> dict:
-    """
-    Extract additional information from pin function name.
-    Returns dict with: edge, bank, group, pair, capabilities, description
-    """
-    info = {
-        'edge': None,
-        'bank': None,
-        'group': None,
-        'pair': None,
-        'differential': None,
-        'capabilities': [],
-        'description': None,
-    }
+PinInfo = namedtuple(
+    'PinInfo',
+    'edge bank group pair differential capabilities description',
+    defaults=(None, None, None, None, None, (), None),
+)
 
-    func = pin_function
 
+# Pin functions matched by exact name: (description, capabilities)
+EXACT_PINS = {
     # Power pins
-    if func == 'VCC':
-        info['description'] = 'Core power supply (1.1V)'
-        info['capabilities'] = ['power']
-        return info
-
-    if func == 'GND':
-        info['description'] = 'Ground'
-        info['capabilities'] = ['ground']
-        return info
-
-    if func == 'VCCAUX':
-        info['description'] = 'Auxiliary power for differential/referenced inputs (2.5V)'
-        info['capabilities'] = ['power']
-        return info
-
-    if func.startswith('VCCio'):
-        match = re.match(r'VCCio(\d+)', func)
-        if match:
-            info['bank'] = int(match.group(1))
-            info['description'] = f'I/O bank {info["bank"]} power supply'
-            info['capabilities'] = ['power']
-        return info
-
-    if func.startswith('VCCA'):
-        match = re.match(r'VCCA(\d+)', func)
-        if match:
-            info['description'] = f'PLL {match.group(1)} analog power (1.1V)'
-            info['capabilities'] = ['power']
-        return info
-
-    if func.startswith('VCCHRX') or func.startswith('VCCHTX') or func.startswith('VCCAUXA'):
-        info['description'] = 'SERDES power supply'
-        info['capabilities'] = ['power', 'serdes']
-        return info
-
-    if func.startswith('VREF1_'):
-        match = re.match(r'VREF1_(\d+)', func)
-        if match:
-            info['bank'] = int(match.group(1))
-            info['description'] = f'Reference voltage input for bank {info["bank"]}'
-            info['capabilities'] = ['vref', 'gpio']
-        return info
-
+    'VCC': ('Core power supply (1.1V)', ('power',)),
+    'GND': ('Ground', ('ground',)),
+    'VCCAUX': ('Auxiliary power for differential/referenced inputs (2.5V)', ('power',)),
+    # Configuration pins
+    'TMS': ('Test Mode Select - JTAG state machine control', ('jtag',)),
+    'TCK': ('Test Clock - JTAG clock input', ('jtag',)),
+    'TDI': ('Test Data In - JTAG data input', ('jtag',)),
+    'TDO': ('Test Data Out - JTAG data output', ('jtag',)),
+    'INITN': ('Configuration ready indicator (active low, open drain)', ('config',)),
+    'PROGRAMN': ('Configuration initiate (active low)', ('config',)),
+    'DONE': ('Configuration complete indicator (open drain)', ('config',)),
+    'CCLK': ('Configuration clock', ('config',)),
+    'CSSPIN': ('SPI flash chip select', ('config', 'spi')),
+    'D0/MOSI': ('SPI MOSI / Parallel config D0', ('config', 'spi', 'gpio')),
+    'D1/MISO': ('SPI MISO / Parallel config D1', ('config', 'spi', 'gpio')),
+    'D2/WPn': ('SPI Write Protect / Parallel config D2', ('config', 'spi', 'gpio')),
+    'D3/HOLDn': ('SPI Hold / Parallel config D3', ('config', 'spi', 'gpio')),
+    'SN/CSn': ('Chip select for parallel config', ('config', 'gpio')),
+    'CS1n': ('Secondary chip select', ('config', 'gpio')),
+    'WRITEn': ('Write enable for parallel config', ('config', 'gpio')),
+    'DOUT/CSOn': ('Serial data out / SPI chip select out', ('config', 'gpio')),
+    'CFG_0': ('Configuration mode bit 0', ('config',)),
+    'CFG_1': ('Configuration mode bit 1', ('config',)),
+    'CFG_2': ('Configuration mode bit 2', ('config',)),
+}
+
+# Primary Clock pins: PCLK[T/C][Bank]_[num]
+PCLK_RE = re.compile(r'PCLK([TC])(\d)_(\d)')
+# General Routing Primary Clock: GR_PCLK[Bank]_[num]
+GR_PCLK_RE = re.compile(r'GR_PCLK(\d)_(\d)')
+# GPLL input pins
+GPLL_RE = re.compile(r'GPLL(\d)([TC])_IN')
+# SERDES pins
+SERDES_RE = re.compile(r'HD(TX|RX)([PN])(\d)_D(\d)CH(\d)')
+REFCLK_RE = re.compile(r'REFCLK([PN])_D(\d)')
+
+# Prefix handlers take the pin function and return PinInfo, or None to fall
+# back to the default. Power, VREF and SERDES prefixes claim the pin even when
+# the rest of the name doesn't parse. Simple "prefix + number" names are
+# parsed by slicing rather than with a regex.
+
+
+def _leading_number(func: str, start: int) -> tuple:
+    """Return (digits, end) for the run of decimal digits at func[start:]."""
+    end = start
+    while end < len(func) and func[end].isdecimal():
+        end += 1
+    return func[start:end], end
+
+
+def _vccio_info(func: str) -> PinInfo:
+    digits, _ = _leading_number(func, len('VCCio'))
+    if not digits:
+        return PinInfo()
+    bank = int(digits)
+    return PinInfo(bank=bank, capabilities=('power',),
+                   description=f'I/O bank {bank} power supply')
+
+
+def _vcca_info(func: str) -> PinInfo:
+    digits, _ = _leading_number(func, len('VCCA'))
+    if not digits:
+        return PinInfo()
+    return PinInfo(capabilities=('power',),
+                   description=f'PLL {digits} analog power (1.1V)')
+
+
+def _serdes_power_info(func: str) -> PinInfo:
+    return PinInfo(capabilities=('power', 'serdes'), description='SERDES power supply')
+
+
+def _vref_info(func: str) -> PinInfo:
+    digits, _ = _leading_number(func, len('VREF1_'))
+    if not digits:
+        return PinInfo()
+    bank = int(digits)
+    return PinInfo(bank=bank, capabilities=('vref', 'gpio'),
+                   description=f'Reference voltage input for bank {bank}')
+
+
+def _lr_edge_info(func: str) -> Optional[PinInfo]:
     # Left/Right edge I/O: P[L/R][Group]_[A/B/C/D]
-    match = re.match(r'P([LR])(\d+)([A-D])', func)
-    if match:
-        info['edge'] = 'left' if match.group(1) == 'L' else 'right'
-        info['group'] = int(match.group(2))
-        pio = match.group(3)
-        info['pair'] = 'AB' if pio in ('A', 'B') else 'CD'
-        info['differential'] = 'true_lvds' if pio in ('A', 'B') else 'lvds_input'
-        info['capabilities'] = ['gpio', 'lvds_input']
-        if pio in ('A', 'B'):
-            info['capabilities'].append('lvds_output')
-        info['description'] = f'{info["edge"].title()} edge PIO group {info["group"]}{pio}'
-
-        # Determine bank from group number (approximate - depends on package)
-        # Left side: banks 6, 7 (bottom to top)
-        # Right side: banks 2, 3 (bottom to top)
-        if info['edge'] == 'left':
-            info['bank'] = 6 if info['group'] < 50 else 7
-        else:
-            info['bank'] = 2 if info['group'] < 50 else 3
-        return info
-
+    digits, end = _leading_number(func, 2)
+    if not digits or end == len(func) or func[end] not in 'ABCD':
+        return None
+    edge = 'left' if func[1] == 'L' else 'right'
+    group = int(digits)
+    pio = func[end]
+    true_lvds = pio in ('A', 'B')
+
+    # Determine bank from group number (approximate - depends on package)
+    # Left side: banks 6, 7 (bottom to top)
+    # Right side: banks 2, 3 (bottom to top)
+    if edge == 'left':
+        bank = 6 if group < 50 else 7
+    else:
+        bank = 2 if group < 50 else 3
+
+    return PinInfo(
+        edge=edge,
+        bank=bank,
+        group=group,
+        pair='AB' if true_lvds else 'CD',
+        differential='true_lvds' if true_lvds else 'lvds_input',
+        capabilities=('gpio', 'lvds_input', 'lvds_output') if true_lvds else ('gpio', 'lvds_input'),
+        description=f'{edge.title()} edge PIO group {group}{pio}',
+    )
+
+
+def _tb_edge_info(func: str) -> Optional[PinInfo]:
     # Top/Bottom edge I/O: P[T/B][Group]_[A/B]
-    match = re.match(r'P([TB])(\d+)([AB])', func)
-    if match:
-        info['edge'] = 'top' if match.group(1) == 'T' else 'bottom'
-        info['group'] = int(match.group(2))
-        pio = match.group(3)
-        info['pair'] = 'AB'
-        info['differential'] = 'emulated'  # Top/bottom only support emulated differential
-        info['capabilities'] = ['gpio', 'emulated_lvds_output']
-        info['description'] = f'{info["edge"].title()} edge PIO group {info["group"]}{pio}'
-
-        # Determine bank from position
-        # Top: banks 0, 1 (left to right)
-        # Bottom: banks 6, 7, 8 (configuration bank)
-        if info['edge'] == 'top':
-            info['bank'] = 0 if info['group'] < 60 else 1
-        return info
-
-    # Primary Clock pins: PCLK[T/C][Bank]_[num]
-    match = re.match(r'PCLK([TC])(\d)_(\d)', func)
-    if match:
-        polarity = 'true' if match.group(1) == 'T' else 'complement'
-        info['bank'] = int(match.group(2))
-        clk_num = int(match.group(3))
-        info['capabilities'] = ['gpio', 'primary_clock', 'pll_input']
-        info['differential'] = 'clock_pair'
-        info['description'] = f'Primary clock {clk_num} ({polarity}) for bank {info["bank"]}'
-        return info
-
-    # General Routing Primary Clock: GR_PCLK[Bank]_[num]
-    match = re.match(r'GR_PCLK(\d)_(\d)', func)
-    if match:
-        info['bank'] = int(match.group(1))
-        clk_num = int(match.group(2))
-        info['capabilities'] = ['gpio', 'general_routing_clock']
-        info['description'] = f'General routing to primary clock {clk_num} for bank {info["bank"]}'
-        return info
-
-    # GPLL input pins
-    match = re.match(r'GPLL(\d)([TC])_IN', func)
-    if match:
-        polarity = 'true' if match.group(2) == 'T' else 'complement'
-        info['capabilities'] = ['gpio', 'pll_input']
-        info['description'] = f'General purpose PLL input ({polarity})'
-        return info
+    digits, end = _leading_number(func, 2)
+    if not digits or end == len(func) or func[end] not in 'AB':
+        return None
+    edge = 'top' if func[1] == 'T' else 'bottom'
+    group = int(digits)
+    pio = func[end]
+
+    # Determine bank from position
+    # Top: banks 0, 1 (left to right)
+    # Bottom: banks 6, 7, 8 (configuration bank)
+    bank = None
+    if edge == 'top':
+        bank = 0 if group < 60 else 1
+
+    return PinInfo(
+        edge=edge,
+        bank=bank,
+        group=group,
+        pair='AB',
+        differential='emulated',  # Top/bottom only support emulated differential
+        capabilities=('gpio', 'emulated_lvds_output'),
+        description=f'{edge.title()} edge PIO group {group}{pio}',
+    )
+
+
+def _pclk_info(func: str) -> Optional[PinInfo]:
+    match = PCLK_RE.match(func)
+    if not match:
+        return None
+    polarity = 'true' if match.group(1) == 'T' else 'complement'
+    bank = int(match.group(2))
+    clk_num = int(match.group(3))
+    return PinInfo(
+        bank=bank,
+        differential='clock_pair',
+        capabilities=('gpio', 'primary_clock', 'pll_input'),
+        description=f'Primary clock {clk_num} ({polarity}) for bank {bank}',
+    )
+
+
+def _gr_pclk_info(func: str) -> Optional[PinInfo]:
+    match = GR_PCLK_RE.match(func)
+    if not match:
+        return None
+    bank = int(match.group(1))
+    clk_num = int(match.group(2))
+    return PinInfo(
+        bank=bank,
+        capabilities=('gpio', 'general_routing_clock'),
+        description=f'General routing to primary clock {clk_num} for bank {bank}',
+    )
+
+
+def _gpll_info(func: str) -> Optional[PinInfo]:
+    match = GPLL_RE.match(func)
+    if not match:
+        return None
+    polarity = 'true' if match.group(2) == 'T' else 'complement'
+    return PinInfo(capabilities=('gpio', 'pll_input'),
+                   description=f'General purpose PLL input ({polarity})')
+
+
+def _serdes_info(func: str) -> PinInfo:
+    match = SERDES_RE.match(func)
+    if not match:
+        return PinInfo()
+    direction = 'transmit' if match.group(1) == 'TX' else 'receive'
+    polarity = 'positive' if match.group(2) == 'P' else 'negative'
+    return PinInfo(capabilities=('serdes',),
+                   description=f'SERDES {direction} differential {polarity}')
+
+
+def _refclk_info(func: str) -> PinInfo:
+    match = REFCLK_RE.match(func)
+    if not match:
+        return PinInfo()
+    polarity = 'positive' if match.group(1) == 'P' else 'negative'
+    return PinInfo(capabilities=('serdes', 'reference_clock'),
+                   description=f'SERDES reference clock {polarity}')
+
+
+# First two characters of the pin function -> (prefix, handler) candidates,
+# tried in order
+PREFIX_DISPATCH = {
+    'VC': (
+        ('VCCio', _vccio_info),
+        ('VCCAUXA', _serdes_power_info),
+        ('VCCHRX', _serdes_power_info),
+        ('VCCHTX', _serdes_power_info),
+        ('VCCA', _vcca_info),
+    ),
+    'VR': (('VREF1_', _vref_info),),
+    'PL': (('PL', _lr_edge_info),),
+    'PR': (('PR', _lr_edge_info),),
+    'PT': (('PT', _tb_edge_info),),
+    'PB': (('PB', _tb_edge_info),),
+    'PC': (('PCLK', _pclk_info),),
+    'GR': (('GR_PCLK', _gr_pclk_info),),
+    'GP': (('GPLL', _gpll_info),),
+    'HD': (('HD', _serdes_info),),
+    'RE': (('REFCLK', _refclk_info),),
+}
+
+
+@lru_cache(maxsize=4096)
+def get_pin_info(pin_function: str) -> PinInfo:
+    """
+    Extract additional information from pin function name.
+    Returns PinInfo with: edge, bank, group, pair, differential, capabilities, description
+    """
+    func = pin_function
 
-    # Configuration pins
-    config_pins = {
-        'TMS': ('Test Mode Select - JTAG state machine control', ['jtag']),
-        'TCK': ('Test Clock - JTAG clock input', ['jtag']),
-        'TDI': ('Test Data In - JTAG data input', ['jtag']),
-        'TDO': ('Test Data Out - JTAG data output', ['jtag']),
-        'INITN': ('Configuration ready indicator (active low, open drain)', ['config']),
-        'PROGRAMN': ('Configuration initiate (active low)', ['config']),
-        'DONE': ('Configuration complete indicator (open drain)', ['config']),
-        'CCLK': ('Configuration clock', ['config']),
-        'CSSPIN': ('SPI flash chip select', ['config', 'spi']),
-        'D0/MOSI': ('SPI MOSI / Parallel config D0', ['config', 'spi', 'gpio']),
-        'D1/MISO': ('SPI MISO / Parallel config D1', ['config', 'spi', 'gpio']),
-        'D2/WPn': ('SPI Write Protect / Parallel config D2', ['config', 'spi', 'gpio']),
-        'D3/HOLDn': ('SPI Hold / Parallel config D3', ['config', 'spi', 'gpio']),
-        'SN/CSn': ('Chip select for parallel config', ['config', 'gpio']),
-        'CS1n': ('Secondary chip select', ['config', 'gpio']),
-        'WRITEn': ('Write enable for parallel config', ['config', 'gpio']),
-        'DOUT/CSOn': ('Serial data out / SPI chip select out', ['config', 'gpio']),
-        'CFG_0': ('Configuration mode bit 0', ['config']),
-        'CFG_1': ('Configuration mode bit 1', ['config']),
-        'CFG_2': ('Configuration mode bit 2', ['config']),
-    }
-
-    if func in config_pins:
-        info['description'], info['capabilities'] = config_pins[func]
-        return info
-
-    # SERDES pins
-    if func.startswith('HD'):
-        match = re.match(r'HD(TX|RX)([PN])(\d)_D(\d)CH(\d)', func)
-        if match:
-            direction = 'transmit' if match.group(1) == 'TX' else 'receive'
-            polarity = 'positive' if match.group(2) == 'P' else 'negative'
-            info['capabilities'] = ['serdes']
-            info['description'] = f'SERDES {direction} differential {polarity}'
-        return info
-
-    if func.startswith('REFCLK'):
-        match = re.match(r'REFCLK([PN])_D(\d)', func)
-        if match:
-            polarity = 'positive' if match.group(1) == 'P' else 'negative'
-            info['capabilities'] = ['serdes', 'reference_clock']
-            info['description'] = f'SERDES reference clock {polarity}'
-        return info
+    # Power, ground and configuration pins
+    exact = EXACT_PINS.get(func)
+    if exact:
+        return PinInfo(description=exact[0], capabilities=exact[1])
+
+    for prefix, handler in PREFIX_DISPATCH.get(func[:2], ()):
+        if func.startswith(prefix):
+            info = handler(func)
+            if info is not None:
+                return info
 
     # Default for unrecognized pins
-    info['description'] = f'Pin function: {func}'
-    info['capabilities'] = ['gpio']
-    return info
+    return PinInfo(capabilities=('gpio',), description=f'Pin function: {func}')
 
 
 def augment_pinout(input_path: str, output_path: str):
     """Load pinout JSON, augment with additional info, and save."""
 
-    with open(input_path, 'r') as f:
+    with open(input_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
     # Process each page
@@ -216,27 +287,27 @@ def augment_pinout(input_path: str, output_path: str):
                 pin_info = get_pin_info(pin['pin_function'])
 
                 # Add non-None fields
-                for key, value in pin_info.items():
+                for key, value in zip(PinInfo._fields, pin_info):
                     if value is not None:
-                        pin[key] = value
+                        pin[key] = list(value) if key == 'capabilities' else value
 
-    # Write augmented JSON
-    with open(output_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Write augmented JSON (indented - this is the copy people read)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
 
     # Print summary
     print(f"Augmented pinout saved to {output_path}")
 
     # Count capabilities
-    cap_counts = {}
-    for page, categories in data.items():
-        for category, pins in categories.items():
-            for pin in pins:
-                for cap in pin.get('capabilities', []):
-                    cap_counts[cap] = cap_counts.get(cap, 0) + 1
+    cap_counts = Counter(chain.from_iterable(
+        pin.get('capabilities', ())
+        for categories in data.values()
+        for pins in categories.values()
+        for pin in pins
+    ))
 
     print("\nCapabilities summary:")
-    for cap, count in sorted(cap_counts.items(), key=lambda x: -x[1]):
+    for cap, count in cap_counts.most_common():
         print(f"  {cap}: {count} pins")
 
 
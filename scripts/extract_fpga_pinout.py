@@ -7,7 +7,10 @@ Generates a pinout JSON for the ECP5 FPGA (U1), organized by schematic page.
 import json
 import re
 import sys
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
+from typing import Optional
 
 
 # Map categories to schematic pages
@@ -30,96 +33,117 @@ CATEGORY_TO_PAGE = {
 
 # Page order matching schematic hierarchy
 PAGE_ORDER = ['power', 'flash', 'ram', 'usb', 'card', 'gpio', 'unconnected', 'other']
+PAGE_RANK = {page: rank for rank, page in enumerate(PAGE_ORDER)}
+
+
+# Netlist patterns, see parse_netlist
+NETS_RE = re.compile(r'\(nets\s*(.*)\)\s*\)$', re.DOTALL)
+
+# Each net block: code, name, then the body up to the next net. The body
+# runs over non-paren text in bulk and only checks for the next net header
+# at a '(' - a lazy .*? would try that lookahead at every character.
+NET_RE = re.compile(
+    r'\(net\s+\(code\s+"(\d+)"\)\s+\(name\s+"([^"]+)"\)[^)]*\)'
+    r'([^(]*(?:\((?!net\s+\(code)[^(]*)*)'
+)
+
+# U1 (FPGA) nodes within a net
+U1_NODE_RE = re.compile(
+    r'\(node\s+\(ref\s+"U1"\)\s+\(pin\s+"([^"]+)"\)\s+\(pinfunction\s+"([^"]+)"\)',
+    re.DOTALL
+)
 
 
 def parse_netlist(netlist_path: str) -> list[dict]:
-    """Parse KiCad netlist and extract FPGA pin assignments."""
+    """
+    Parse KiCad netlist and extract FPGA pin assignments.
+    Each pin also carries '_net_lower', the lowercased net name, for the
+    categorize/sort helpers; main() leaves it out of the output.
+    """
 
     with open(netlist_path, 'r') as f:
         content = f.read()
 
     # Find the nets section
-    nets_match = re.search(r'\(nets\s*(.*)\)\s*\)$', content, re.DOTALL)
+    nets_match = NETS_RE.search(content)
     if not nets_match:
         print("Error: Could not find nets section", file=sys.stderr)
         return []
 
-    nets_content = nets_match.group(1)
-
-    # Pattern to match each net block
-    net_pattern = re.compile(
-        r'\(net\s+\(code\s+"(\d+)"\)\s+\(name\s+"([^"]+)"\)[^)]*\)'
-        r'(.*?)(?=\(net\s+\(code|$)',
-        re.DOTALL
-    )
-
-    # Pattern to match U1 (FPGA) nodes within a net
-    u1_node_pattern = re.compile(
-        r'\(node\s+\(ref\s+"U1"\)\s+\(pin\s+"([^"]+)"\)\s+\(pinfunction\s+"([^"]+)"\)',
-        re.DOTALL
-    )
-
     pins = []
 
-    for net_match in net_pattern.finditer(nets_content):
-        net_code = net_match.group(1)
-        net_name = net_match.group(2)
-        net_body = net_match.group(3)
+    # Scan the nets section in place rather than slicing it out
+    for net_match in NET_RE.finditer(content, nets_match.start(1), nets_match.end(1)):
+        net_name = sys.intern(net_match.group(2))
+        net_lower = net_name.lower()
 
         # Find all U1 pins in this net
-        for node_match in u1_node_pattern.finditer(net_body):
-            ball = node_match.group(1)
-            pin_function = node_match.group(2)
-
+        for node_match in U1_NODE_RE.finditer(content, net_match.start(3), net_match.end(3)):
+            # Interned so repeated pin functions (GND, VCCio3, ...) share
+            # one string and compare by identity first
             pins.append({
-                'ball': ball,
-                'pin_function': pin_function,
+                'ball': sys.intern(node_match.group(1)),
+                'pin_function': sys.intern(node_match.group(2)),
                 'net_name': net_name,
+                '_net_lower': net_lower,
             })
 
     return pins
 
 
-def categorize_pin(net_name: str, pin_function: str) -> str:
-    """Categorize pin by function."""
-    net_lower = net_name.lower()
-    func_lower = pin_function.lower()
+# Net name keywords per category, checked in categorize_pin's order
+FLASH_KEYWORDS = ('flash', 'miso', 'mosi', 'sck', 'csspin')
+JTAG_KEYWORDS = ('jtag', 'tdi', 'tdo', 'tck', 'tms')
+DATA_BUS_KEYWORDS = ('d0_', 'd1_', 'd2_', 'd3_', 'd4_', 'd5_', 'd6_', 'd7_')
+CONTROL_KEYWORDS = ('dma', 'irq', 'nmi', 'rdy', 'res', 'inh')
+GPIO_HEADER_KEYWORDS = ('gp', 'gn', 'led', 'sw', 'audio', 'wifi')
+# Apple II misc signals
+MISC_CONTROL_KEYWORDS = ('7m_', 'q3_', 'sync', 'int_in', 'int_out', 'r{slash}~{w}', 'device_select')
+
+ADDRESS_RE = re.compile(r'a\d+_3v3')
+# J1 GPIO breakout header (directly to FPGA, no level shifters)
+GPIO_BREAKOUT_RE = re.compile(r'i.*o_pin_\d+')
+
+
+def categorize_pin(net_name: str, pin_function: str, net_lower: Optional[str] = None) -> str:
+    """Categorize pin by function. Pass net_lower if the caller already has it."""
+    if net_lower is None:
+        net_lower = net_name.lower()
+    # Bound method, so the keyword scans below stay in C
+    has = net_lower.__contains__
 
     # Check for unconnected pins first
     if 'unconnected' in net_lower:
         return 'Unconnected'
 
-    if 'vcc' in func_lower or '+' in net_name:
+    if '+' in net_name or 'vcc' in pin_function.lower():
         return 'Power'
     if 'gnd' in net_lower:
         return 'Ground'
     if 'sdram' in net_lower or net_name.startswith('RAM_'):
         return 'SDRAM'
-    if any(x in net_lower for x in ['flash', 'miso', 'mosi', 'sck', 'csspin']):
+    if any(map(has, FLASH_KEYWORDS)):
         return 'Flash/Config'
-    if any(x in net_lower for x in ['jtag', 'tdi', 'tdo', 'tck', 'tms']):
+    if any(map(has, JTAG_KEYWORDS)):
         return 'JTAG'
-    if any(x in net_lower for x in ['d0_', 'd1_', 'd2_', 'd3_', 'd4_', 'd5_', 'd6_', 'd7_']):
+    if any(map(has, DATA_BUS_KEYWORDS)):
         return 'Apple II Data'
-    if re.match(r'a\d+_3v3', net_lower):
+    if ADDRESS_RE.match(net_lower):
         return 'Apple II Address'
     if 'clk' in net_lower or 'phi' in net_lower:
         return 'Clock'
-    if any(x in net_lower for x in ['dma', 'irq', 'nmi', 'rdy', 'res', 'inh']):
+    if any(map(has, CONTROL_KEYWORDS)):
         return 'Apple II Control'
-    # J1 GPIO breakout header (directly to FPGA, no level shifters)
-    if re.search(r'i.*o_pin_\d+', net_lower):
+    if GPIO_BREAKOUT_RE.search(net_lower):
         return 'GPIO Breakout'
     # Apple II slot I/O select/strobe signals
     if 'i{slash}o' in net_lower:
         return 'Apple II I/O'
-    if any(x in net_lower for x in ['gp', 'gn', 'led', 'sw', 'audio', 'wifi']):
+    if any(map(has, GPIO_HEADER_KEYWORDS)):
         return 'GPIO Header'
     if 'usb' in net_lower or 'ftdi' in net_lower:
         return 'USB/Serial'
-    # Apple II misc signals
-    if any(x in net_lower for x in ['7m_', 'q3_', 'sync', 'int_in', 'int_out',
-                                     'r{slash}~{w}', 'device_select']):
+    if any(map(has, MISC_CONTROL_KEYWORDS)):
         return 'Apple II Control'
 
     return 'Other'
@@ -133,6 +157,51 @@ def ball_sort_key(ball: str) -> tuple:
     return (ball, 0)
 
 
+# Signal sort tables, see get_signal_sort_key
+VOLTAGE_ORDER = {'+1V1': 1, '+2V5': 2, '+3V3': 3}
+
+SDRAM_CONTROL_ORDER = {
+    'CLK': 0, 'CKE': 1, 'nCS': 2, 'nRAS': 3, 'nCAS': 4, 'nWE': 5,
+    'DQM0': 6, 'DQM1': 7, 'BA0': 8, 'BA1': 9
+}
+
+FLASH_ORDER = {
+    '/flash/FLASH_nCS': 0,
+    '/flash/FLASH_SCK': 1,
+    '/flash/FLASH_MOSI': 2,
+    '/flash/FLASH_MISO': 3,
+    '/flash/FLASH_nWP': 4,
+    '/flash/FLASH_nHOLD': 5,
+    '/flash/FPGA_PROGRAMN': 6,
+    '/flash/FPGA_INITN': 7,
+    '/flash/FPGA_DONE': 8,
+}
+
+JTAG_ORDER = {'TCK': 0, 'TMS': 1, 'TDI': 2, 'TDO': 3}
+
+CLOCK_ORDER = {'CLK_25MHz': 0, 'PHI0_3V3': 1, 'PHI1_3V3': 2}
+
+# Control signals: alphabetical but group related signals
+CONTROL_GROUPS = {
+    'PHI0': 0, 'PHI1': 1, '7M': 2, 'Q3': 3, 'Sync': 4,
+    'R/~W': 10, 'RDY': 11,
+    'IRQ': 20, 'NMI': 21, 'RES': 22,
+    'DMA': 30, 'INH': 31,
+    'DEVICE_SELECT': 40, 'I/O_SELECT': 41, 'I/O_STROBE': 42,
+    'INT_IN': 50, 'INT_OUT': 51,
+}
+CONTROL_ORDER = {prefix.lower(): order for prefix, order in CONTROL_GROUPS.items()}
+
+VCCIO_RE = re.compile(r'VCCio(\d+)')
+ADDRESS_BUS_RE = re.compile(r'A(\d+)_3V3')
+DATA_BUS_RE = re.compile(r'D(\d+)_3V3')
+IO_PIN_RE = re.compile(r'I.*O_PIN_(\d+)')
+SDRAM_ADDR_RE = re.compile(r'A(\d+)')
+SDRAM_DATA_RE = re.compile(r'D(\d+)')
+# Lookahead so overlapping control prefixes are all found
+CONTROL_RE = re.compile('(?=(' + '|'.join(map(re.escape, CONTROL_ORDER)) + '))')
+
+
 def get_signal_sort_key(pin: dict) -> tuple:
     """
     Get sort key based on signal semantics.
@@ -140,13 +209,13 @@ def get_signal_sort_key(pin: dict) -> tuple:
     """
     net = pin['net_name']
     func = pin['pin_function']
+    net_lower = pin.get('_net_lower') or net.lower()
 
     # Power pins: sort by voltage, then by function type
     if pin.get('category') in ('Power', 'Ground'):
         if 'GND' in net:
             return (0, 0, ball_sort_key(pin['ball']))
-        voltage_order = {'+1V1': 1, '+2V5': 2, '+3V3': 3}
-        voltage = voltage_order.get(net, 9)
+        voltage = VOLTAGE_ORDER.get(net, 9)
         # Sub-sort: VCC core, VCCA, VCCAUX, VCCio
         if 'VCC' == func:
             func_order = 0
@@ -156,24 +225,24 @@ def get_signal_sort_key(pin: dict) -> tuple:
             func_order = 2
         elif 'VCCio' in func:
             # Extract bank number
-            match = re.search(r'VCCio(\d+)', func)
+            match = VCCIO_RE.search(func)
             func_order = 3 + (int(match.group(1)) if match else 0)
         else:
             func_order = 99
         return (voltage, func_order, ball_sort_key(pin['ball']))
 
     # Address bus: sort by bit number (A0-A15)
-    match = re.match(r'A(\d+)_3V3', net)
+    match = ADDRESS_BUS_RE.match(net)
     if match:
         return (0, int(match.group(1)))
 
     # Data bus: sort by bit number (D0-D7)
-    match = re.match(r'D(\d+)_3V3', net)
+    match = DATA_BUS_RE.match(net)
     if match:
         return (0, int(match.group(1)))
 
     # I/O pins: sort by pin number
-    match = re.search(r'I.*O_PIN_(\d+)', net)
+    match = IO_PIN_RE.search(net)
     if match:
         return (0, int(match.group(1)))
 
@@ -181,59 +250,34 @@ def get_signal_sort_key(pin: dict) -> tuple:
     if 'SDRAM' in net:
         signal = net.replace('SDRAM_', '')
         # Control signals first
-        control_order = {
-            'CLK': 0, 'CKE': 1, 'nCS': 2, 'nRAS': 3, 'nCAS': 4, 'nWE': 5,
-            'DQM0': 6, 'DQM1': 7, 'BA0': 8, 'BA1': 9
-        }
-        if signal in control_order:
-            return (0, control_order[signal])
+        if signal in SDRAM_CONTROL_ORDER:
+            return (0, SDRAM_CONTROL_ORDER[signal])
         # Address bits
-        match = re.match(r'A(\d+)', signal)
+        match = SDRAM_ADDR_RE.match(signal)
         if match:
             return (1, int(match.group(1)))
         # Data bits
-        match = re.match(r'D(\d+)', signal)
+        match = SDRAM_DATA_RE.match(signal)
         if match:
             return (2, int(match.group(1)))
         return (3, 0)
 
     # Flash/config: logical order
-    flash_order = {
-        '/flash/FLASH_nCS': 0,
-        '/flash/FLASH_SCK': 1,
-        '/flash/FLASH_MOSI': 2,
-        '/flash/FLASH_MISO': 3,
-        '/flash/FLASH_nWP': 4,
-        '/flash/FLASH_nHOLD': 5,
-        '/flash/FPGA_PROGRAMN': 6,
-        '/flash/FPGA_INITN': 7,
-        '/flash/FPGA_DONE': 8,
-    }
-    if net in flash_order:
-        return (0, flash_order[net])
+    if net in FLASH_ORDER:
+        return (0, FLASH_ORDER[net])
 
     # JTAG: standard order
-    jtag_order = {'TCK': 0, 'TMS': 1, 'TDI': 2, 'TDO': 3}
-    if func in jtag_order:
-        return (0, jtag_order[func])
+    if func in JTAG_ORDER:
+        return (0, JTAG_ORDER[func])
 
     # Clock signals
-    clock_order = {'CLK_25MHz': 0, 'PHI0_3V3': 1, 'PHI1_3V3': 2}
-    if net in clock_order:
-        return (0, clock_order[net])
-
-    # Control signals: alphabetical but group related signals
-    control_groups = {
-        'PHI0': 0, 'PHI1': 1, '7M': 2, 'Q3': 3, 'Sync': 4,
-        'R/~W': 10, 'RDY': 11,
-        'IRQ': 20, 'NMI': 21, 'RES': 22,
-        'DMA': 30, 'INH': 31,
-        'DEVICE_SELECT': 40, 'I/O_SELECT': 41, 'I/O_STROBE': 42,
-        'INT_IN': 50, 'INT_OUT': 51,
-    }
-    for prefix, order in control_groups.items():
-        if prefix.lower() in net.lower() or prefix in net:
-            return (0, order)
+    if net in CLOCK_ORDER:
+        return (0, CLOCK_ORDER[net])
+
+    # Control signals: earliest group whose prefix appears in the net name
+    orders = [CONTROL_ORDER[m.group(1)] for m in CONTROL_RE.finditer(net_lower)]
+    if orders:
+        return (0, min(orders))
 
     # Default: sort by net name
     return (99, net)
@@ -259,45 +303,35 @@ def main():
         sys.exit(1)
 
     # Add category and page to each pin
+    category_rank = {}
     for pin in pins:
-        pin['category'] = categorize_pin(pin['net_name'], pin['pin_function'])
+        pin['category'] = categorize_pin(pin['net_name'], pin['pin_function'], pin['_net_lower'])
         pin['page'] = CATEGORY_TO_PAGE.get(pin['category'], 'other')
+        # Categories appear within a page in the order they're first seen
+        category_rank.setdefault(pin['category'], len(category_rank))
 
-    # Organize by page, then by category, sorted by ball
-    output = {}
-    for page in PAGE_ORDER:
-        page_pins = [p for p in pins if p['page'] == page]
-        if not page_pins:
-            continue
-
-        # Group by category within page
-        categories = {}
-        for pin in page_pins:
-            cat = pin['category']
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append({
-                'ball': pin['ball'],
-                'pin_function': pin['pin_function'],
-                'net_name': pin['net_name'],
-            })
-
-        # Sort pins within each category by signal semantics
-        for cat in categories:
-            # Add category to pins for sorting context
-            for p in categories[cat]:
-                p['category'] = cat
-            categories[cat].sort(key=get_signal_sort_key)
-            # Remove category from output
-            for p in categories[cat]:
-                del p['category']
+    # One sort: by page, then category, then signal semantics
+    pins.sort(key=lambda p: (PAGE_RANK[p['page']], category_rank[p['category']],
+                             get_signal_sort_key(p)))
 
-        output[page] = categories
+    # Organize by page, then by category
+    output = {}
+    for (page, cat), cat_pins in groupby(pins, key=itemgetter('page', 'category')):
+        output.setdefault(page, {})[cat] = [
+            {
+                'ball': p['ball'],
+                'pin_function': p['pin_function'],
+                'net_name': p['net_name'],
+            }
+            for p in cat_pins
+        ]
 
     # Write JSON
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, 'w') as f:
-        json.dump(output, f, indent=2)
+    # Compact JSON: this is an intermediate that augment_fpga_pinout.py
+    # rewrites (indented) in place
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, separators=(',', ':'))
 
     print(f"Wrote {len(pins)} pins to {output_path}")
 
@@ -8,8 +8,10 @@ Simple starter LPF generator with sensible defaults for Byte Hamr.
 import json
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
+from types import MappingProxyType
 
 
 # =============================================================================
@@ -44,6 +46,7 @@ CONFIG = {
 }
 
 
+@lru_cache(maxsize=4096)
 def sanitize_signal_name(net_name: str) -> str:
     """Convert net name to valid LPF/Verilog signal name."""
     # Remove hierarchy prefix
@@ -63,142 +66,167 @@ def sanitize_signal_name(net_name: str) -> str:
     return name
 
 
-def get_io_settings(pin: dict, category: str) -> dict:
-    """Determine I/O settings based on pin category and function."""
-    net = pin['net_name']
+# Shared, read-only I/O settings per signal class
+IO_PROFILES = {
+    'sdram': MappingProxyType({
+        'io_type': CONFIG['sdram_io_type'],
+        'drive': CONFIG['sdram_drive'],
+        'slewrate': CONFIG['sdram_slewrate'],
+        'pullmode': 'NONE',
+    }),
+    'apple2': MappingProxyType({
+        'io_type': CONFIG['apple2_io_type'],
+        'drive': CONFIG['apple2_drive'],
+        'slewrate': CONFIG['apple2_slewrate'],
+        'pullmode': 'NONE',
+    }),
+    'clock': MappingProxyType({
+        'io_type': 'LVCMOS33',
+        'drive': None,  # Input only
+        'slewrate': None,
+        'pullmode': 'NONE',
+    }),
+    'flash': MappingProxyType({
+        'io_type': CONFIG['flash_io_type'],
+        'drive': CONFIG['flash_drive'],
+        'slewrate': CONFIG['flash_slewrate'],
+        'pullmode': 'UP',  # Flash signals typically need pullups
+    }),
+    'default': MappingProxyType({
+        'io_type': CONFIG['default_io_type'],
+        'drive': CONFIG['default_drive'],
+        'slewrate': CONFIG['default_slewrate'],
+        'pullmode': 'NONE',
+    }),
+}
+
+APPLE2_CATEGORIES = frozenset({
+    'Apple II Address', 'Apple II Data', 'Apple II Control', 'Apple II I/O',
+})
 
+
+def classify_net(net: str, category: str) -> str:
+    """Pick the IO_PROFILES key for a net."""
     # SDRAM signals
     if 'SDRAM' in net:
-        return {
-            'io_type': CONFIG['sdram_io_type'],
-            'drive': CONFIG['sdram_drive'],
-            'slewrate': CONFIG['sdram_slewrate'],
-            'pullmode': 'NONE',
-        }
+        return 'sdram'
 
     # Apple II bus signals
-    if category in ('Apple II Address', 'Apple II Data', 'Apple II Control', 'Apple II I/O'):
-        return {
-            'io_type': CONFIG['apple2_io_type'],
-            'drive': CONFIG['apple2_drive'],
-            'slewrate': CONFIG['apple2_slewrate'],
-            'pullmode': 'NONE',
-        }
+    if category in APPLE2_CATEGORIES:
+        return 'apple2'
 
     # Clock input
     if net == CONFIG['system_clock']:
-        return {
-            'io_type': 'LVCMOS33',
-            'drive': None,  # Input only
-            'slewrate': None,
-            'pullmode': 'NONE',
-        }
+        return 'clock'
 
     # Flash/Config signals
     if 'FLASH' in net or 'FPGA_' in net:
-        return {
-            'io_type': CONFIG['flash_io_type'],
-            'drive': CONFIG['flash_drive'],
-            'slewrate': CONFIG['flash_slewrate'],
-            'pullmode': 'UP',  # Flash signals typically need pullups
-        }
-
-    # Default
-    return {
-        'io_type': CONFIG['default_io_type'],
-        'drive': CONFIG['default_drive'],
-        'slewrate': CONFIG['default_slewrate'],
-        'pullmode': 'NONE',
-    }
+        return 'flash'
 
+    return 'default'
 
-def generate_lpf(pinout_path: str, output_path: str):
-    """Generate LPF file from pinout JSON."""
 
-    with open(pinout_path, 'r') as f:
-        data = json.load(f)
+def get_io_settings(pin: dict, category: str) -> MappingProxyType:
+    """Determine I/O settings based on pin category and function."""
+    return IO_PROFILES[classify_net(pin['net_name'], category)]
+
 
-    lines = []
+# Pages and categories that get no constraints (power, ground, unconnected)
+SKIP_PAGES = frozenset({'power', 'unconnected'})
+SKIP_CATEGORIES = frozenset({'Power', 'Ground'})
 
-    # Header
-    lines.append(f"// =============================================================================")
-    lines.append(f"// Byte Hamr - FPGA Pin Constraints")
-    lines.append(f"// Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append(f"// Source: {pinout_path}")
-    lines.append(f"// =============================================================================")
-    lines.append(f"")
+# LPF text blocks, filled in with str.format()
+FILE_HEADER = """\
+// =============================================================================
+// Byte Hamr - FPGA Pin Constraints
+// Generated: {generated}
+// Source: {source}
+// =============================================================================
 
-    # Frequency constraint for system clock
-    lines.append(f"// =============================================================================")
-    lines.append(f"// Clock Constraints")
-    lines.append(f"// =============================================================================")
-    lines.append(f"FREQUENCY PORT \"{CONFIG['system_clock']}\" {CONFIG['system_clock_freq_mhz']} MHz;")
-    lines.append(f"")
+// =============================================================================
+// Clock Constraints
+// =============================================================================
+FREQUENCY PORT "{clock}" {freq_mhz} MHz;
 
-    # Process each page (skip power, ground, unconnected)
-    skip_pages = {'power', 'unconnected'}
+"""
 
-    for page, categories in data.items():
-        if page in skip_pages:
-            continue
+PAGE_HEADER = """\
+// =============================================================================
+// {page} Signals
+// =============================================================================
+"""
 
-        lines.append(f"// =============================================================================")
-        lines.append(f"// {page.upper()} Signals")
-        lines.append(f"// =============================================================================")
+CATEGORY_HEADER = """
+// {category}
+// ------------------------------------------------------------
+"""
 
-        for category, pins in categories.items():
-            if category in ('Power', 'Ground'):
-                continue
+PIN_CONSTRAINTS = """\
+LOCATE COMP "{signal}" SITE "{ball}";
+IOBUF PORT "{signal}" IO_TYPE={io_type}{drive}{slewrate}{pullmode};
+"""
+
+FILE_FOOTER = """\
+// =============================================================================
+// Default Settings for Unused Pins
+// =============================================================================
+// Pull unused pins to GND to prevent floating inputs
+// IOBUF ALLPORTS PULLMODE={pullmode};
+"""
+
+
+def generate_lpf(pinout_path: str, output_path: str):
+    """Generate LPF file from pinout JSON."""
+
+    with open(pinout_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    pin_count = 0
 
-            lines.append(f"")
-            lines.append(f"// {category}")
-            lines.append(f"// " + "-" * 60)
+    with open(output_path, 'w') as out:
+        # Header and frequency constraint for system clock
+        out.write(FILE_HEADER.format(
+            generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            source=pinout_path,
+            clock=CONFIG['system_clock'],
+            freq_mhz=CONFIG['system_clock_freq_mhz'],
+        ))
+
+        for page, categories in data.items():
+            if page in SKIP_PAGES:
+                continue
 
-            for pin in pins:
-                ball = pin['ball']
-                net = pin['net_name']
-                signal = sanitize_signal_name(net)
-                io = get_io_settings(pin, category)
+            out.write(PAGE_HEADER.format(page=page.upper()))
 
-                # Location constraint
-                lines.append(f"LOCATE COMP \"{signal}\" SITE \"{ball}\";")
+            for category, pins in categories.items():
+                if category in SKIP_CATEGORIES:
+                    continue
 
-                # I/O buffer settings
-                iobuf_parts = [f"IO_TYPE={io['io_type']}"]
-                if io['drive']:
-                    iobuf_parts.append(f"DRIVE={io['drive']}")
-                if io['slewrate']:
-                    iobuf_parts.append(f"SLEWRATE={io['slewrate']}")
-                if io['pullmode']:
-                    iobuf_parts.append(f"PULLMODE={io['pullmode']}")
+                out.write(CATEGORY_HEADER.format(category=category))
+                pin_count += len(pins)
 
-                lines.append(f"IOBUF PORT \"{signal}\" {' '.join(iobuf_parts)};")
+                for pin in pins:
+                    signal = sanitize_signal_name(pin['net_name'])
+                    io = get_io_settings(pin, category)
 
-        lines.append(f"")
+                    # Location constraint and I/O buffer settings
+                    out.write(PIN_CONSTRAINTS.format(
+                        signal=signal,
+                        ball=pin['ball'],
+                        io_type=io['io_type'],
+                        drive=f" DRIVE={io['drive']}" if io['drive'] else '',
+                        slewrate=f" SLEWRATE={io['slewrate']}" if io['slewrate'] else '',
+                        pullmode=f" PULLMODE={io['pullmode']}" if io['pullmode'] else '',
+                    ))
 
-    # Default settings for unused pins
-    lines.append(f"// =============================================================================")
-    lines.append(f"// Default Settings for Unused Pins")
-    lines.append(f"// =============================================================================")
-    lines.append(f"// Pull unused pins to GND to prevent floating inputs")
-    lines.append(f"// IOBUF ALLPORTS PULLMODE={CONFIG['default_pullmode']};")
-    lines.append(f"")
+            out.write('\n')
 
-    # Write output
-    with open(output_path, 'w') as f:
-        f.write('\n'.join(lines))
+        # Default settings for unused pins
+        out.write(FILE_FOOTER.format(pullmode=CONFIG['default_pullmode']))
 
     print(f"Generated LPF: {output_path}")
 
     # Summary
-    pin_count = 0
-    for page, categories in data.items():
-        if page in skip_pages:
-            continue
-        for category, pins in categories.items():
-            if category not in ('Power', 'Ground'):
-                pin_count += len(pins)
-
     print(f"  Constrained {pin_count} signal pins")
     print(f"  System clock: {CONFIG['system_clock']} @ {CONFIG['system_clock_freq_mhz']} MHz")
 